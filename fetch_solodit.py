@@ -1,17 +1,33 @@
 #!/usr/bin/env python3
 """Solodit Findings Crawler - Fetches security audit findings from Solodit API."""
 
+import argparse
+import io
 import json
 import os
 import re
+import signal
 import sys
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any, Optional, Union
 
+import msgspec
 import requests
+import zstandard as zstd
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 from openpyxl import Workbook, load_workbook
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Regex pattern to match illegal Excel characters (control chars except tab, newline, carriage return)
 ILLEGAL_CHARACTERS_RE = re.compile(
     r'[\x00-\x08\x0b\x0c\x0e-\x1f]'
@@ -20,18 +36,48 @@ ILLEGAL_CHARACTERS_RE = re.compile(
 # Configuration
 API_URL = "https://solodit.cyfrin.io/api/v1/solodit/findings"
 PAGE_SIZE = 100
-REQUEST_DELAY = 3  # seconds between requests
-MAX_RETRIES = 3
-RETRY_DELAY = 5  # initial retry delay in seconds
+RATE_LIMIT_REQUESTS = 20  # requests allowed per window
+RATE_LIMIT_WINDOW = 60  # seconds
+FETCH_WORKERS = 4  # pages kept in flight during initial fetch
 
 # File paths
 SCRIPT_DIR = Path(__file__).parent
 STATE_FILE = SCRIPT_DIR / "state.json"
 HIGH_MEDIUM_FILE = SCRIPT_DIR / "high_medium_findings.xlsx"
 LOW_GAS_FILE = SCRIPT_DIR / "low_gas_findings.xlsx"
+HIGH_MEDIUM_LOG = SCRIPT_DIR / "high_medium_findings.jsonl.zst"
+LOW_GAS_LOG = SCRIPT_DIR / "low_gas_findings.jsonl.zst"
+
+# Each append to a findings log is written as a separate zstd frame
+ZSTD_COMPRESSOR = zstd.ZstdCompressor(level=10)
+
+# Shared HTTP session so requests reuse keep-alive connections
+SESSION = requests.Session()
+SESSION.headers.update({"Content-Type": "application/json"})
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=FETCH_WORKERS,
+    # The findings query is a read, so POST is safe to retry
+    max_retries=Retry(
+        total=3,
+        backoff_factor=1,
+        status_forcelist=[429, 502, 503, 504],
+        allowed_methods=["POST"],
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+))
+
+# Sliding-window rate limiter shared by all fetch threads
+_request_lock = threading.Lock()
+_request_times = deque()
+_paused_until = 0.0
+
+# Set by SIGINT/SIGTERM to stop cleanly after the page in progress
+STOP_REQUESTED = threading.Event()
 
 # Column headers for xlsx
-HEADERS = [
+HEADERS = (
     "id", "slug", "title", "impact",
     "quality_score", "general_score",
     "firm_name", "protocol_name",
@@ -40,7 +86,56 @@ HEADERS = [
     "source_link", "github_link", "pdf_link",
     "contest_link", "contest_prize_txt",
     "report_date"
-]
+)
+
+
+# Typed view of the API response. Only the fields written to the xlsx are
+# declared; msgspec skips everything else in the payload while decoding.
+class Tag(msgspec.Struct):
+    title: Any = ""
+
+
+class TagScore(msgspec.Struct):
+    tags_tag: Optional[Tag] = None
+
+
+class Warden(msgspec.Struct):
+    handle: Any = ""
+
+
+class IssueFinder(msgspec.Struct):
+    wardens_warden: Optional[Warden] = None
+
+
+class Finding(msgspec.Struct):
+    id: Union[int, str]
+    slug: Any = ""
+    title: Any = ""
+    impact: Any = ""
+    quality_score: Any = ""
+    general_score: Any = ""
+    firm_name: Any = ""
+    protocol_name: Any = ""
+    content: Any = ""
+    summary: Any = ""
+    issues_issuetagscore: Optional[list[Optional[TagScore]]] = None
+    issues_issue_finders: Optional[list[Optional[IssueFinder]]] = None
+    finders_count: Any = ""
+    source_link: Any = ""
+    github_link: Any = ""
+    pdf_link: Any = ""
+    contest_link: Any = ""
+    contest_prize_txt: Any = ""
+    report_date: Any = ""
+
+
+class PageResponse(msgspec.Struct):
+    findings: Optional[list[Finding]] = None
+    metadata: Optional[dict] = None
+    rate_limit: Optional[dict] = msgspec.field(default=None, name="rateLimit")
+
+
+PAGE_DECODER = msgspec.json.Decoder(PageResponse)
 
 
 def get_api_key():
@@ -61,11 +156,25 @@ def clean_string(value):
     return ILLEGAL_CHARACTERS_RE.sub('', value)
 
 
+def json_loads(data):
+    """Parse JSON from bytes or str, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj):
+    """Serialize to compact UTF-8 JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
 def load_state():
     """Load state from state.json file."""
     if STATE_FILE.exists():
-        with open(STATE_FILE, "r") as f:
-            return json.load(f)
+        with open(STATE_FILE, "rb") as f:
+            return json_loads(f.read())
     return {
         "high_medium_max_id": "0",
         "low_gas_max_id": "0",
@@ -78,53 +187,91 @@ def load_state():
 def save_state(state):
     """Save state to state.json file."""
     state["last_run"] = datetime.now(timezone.utc).isoformat()
-    with open(STATE_FILE, "w") as f:
-        json.dump(state, f, indent=2)
+    # Write a temp file and rename it over the old one, so an interrupted
+    # run can never leave a truncated state.json behind
+    tmp_file = STATE_FILE.with_name(STATE_FILE.name + ".tmp")
+    with open(tmp_file, "wb") as f:
+        f.write(json_dumps(state))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, STATE_FILE)
 
 
 def extract_tags(finding):
     """Extract tags from finding as comma-separated string."""
-    tags = finding.get("issues_issuetagscore", [])
-    return ", ".join(t.get("tags_tag", {}).get("title", "") for t in tags if t.get("tags_tag"))
+    return ", ".join(
+        tag.title
+        for t in finding.issues_issuetagscore or ()
+        if t and (tag := t.tags_tag) and tag.title
+    )
 
 
 def extract_finders(finding):
     """Extract finders from finding as comma-separated string."""
-    finders = finding.get("issues_issue_finders", [])
-    return ", ".join(f.get("wardens_warden", {}).get("handle", "") for f in finders if f.get("wardens_warden"))
+    return ", ".join(
+        warden.handle
+        for f in finding.issues_issue_finders or ()
+        if f and (warden := f.wardens_warden) and warden.handle
+    )
 
 
 def finding_to_row(finding):
-    """Convert a finding dict to a row list for xlsx."""
-    return [
-        finding.get("id", ""),
-        clean_string(finding.get("slug", "")),
-        clean_string(finding.get("title", "")),
-        finding.get("impact", ""),
-        finding.get("quality_score", ""),
-        finding.get("general_score", ""),
-        clean_string(finding.get("firm_name", "")),
-        clean_string(finding.get("protocol_name", "")),
-        clean_string(finding.get("content", "")),
-        clean_string(finding.get("summary", "")),
+    """Convert a Finding to a row tuple for xlsx."""
+    return (
+        finding.id,
+        clean_string(finding.slug),
+        clean_string(finding.title),
+        finding.impact,
+        finding.quality_score,
+        finding.general_score,
+        clean_string(finding.firm_name),
+        clean_string(finding.protocol_name),
+        clean_string(finding.content),
+        clean_string(finding.summary),
         clean_string(extract_tags(finding)),
         clean_string(extract_finders(finding)),
-        finding.get("finders_count", ""),
-        clean_string(finding.get("source_link", "")),
-        clean_string(finding.get("github_link", "")),
-        clean_string(finding.get("pdf_link", "")),
-        clean_string(finding.get("contest_link", "")),
-        clean_string(finding.get("contest_prize_txt", "")),
-        str(finding.get("report_date", "")) if finding.get("report_date") else ""
-    ]
+        finding.finders_count,
+        clean_string(finding.source_link),
+        clean_string(finding.github_link),
+        clean_string(finding.pdf_link),
+        clean_string(finding.contest_link),
+        clean_string(finding.contest_prize_txt),
+        str(finding.report_date) if finding.report_date else ""
+    )
+
+
+def wait_for_request_slot():
+    """Block until a request fits in the rate-limit window, then record it."""
+    while True:
+        with _request_lock:
+            now = time.monotonic()
+            while _request_times and now - _request_times[0] >= RATE_LIMIT_WINDOW:
+                _request_times.popleft()
+
+            wait_time = _paused_until - now
+            if len(_request_times) >= RATE_LIMIT_REQUESTS:
+                wait_time = max(wait_time, _request_times[0] + RATE_LIMIT_WINDOW - now)
+            if wait_time <= 0:
+                _request_times.append(now)
+                return
+        time.sleep(wait_time)
+
+
+def pause_requests_until(reset_time):
+    """Hold back all requests until the given epoch time."""
+    global _paused_until
+    with _request_lock:
+        _paused_until = max(_paused_until, time.monotonic() + reset_time - time.time())
 
 
 def fetch_page(api_key, page, impact_filter):
-    """Fetch a single page of findings with retry logic."""
-    headers = {
-        "Content-Type": "application/json",
-        "X-Cyfrin-API-Key": api_key
-    }
+    """Fetch a single page of findings as a PageResponse.
+
+    Transport errors and 429/502/503/504 responses are retried by the session
+    adapter; a 429 that outlasts those retries also waits for the rate-limit
+    reset once. Anything still failing raises.
+    """
+    headers = {"X-Cyfrin-API-Key": api_key}
     payload = {
         "page": page,
         "pageSize": PAGE_SIZE,
@@ -135,75 +282,184 @@ def fetch_page(api_key, page, impact_filter):
         }
     }
 
-    for attempt in range(MAX_RETRIES):
-        try:
-            response = requests.post(API_URL, headers=headers, json=payload, timeout=30)
-
-            if response.status_code == 429:
-                # Rate limited - wait and retry
-                reset_time = int(response.headers.get("X-RateLimit-Reset", time.time() + 60))
-                wait_time = max(reset_time - time.time(), 60)
-                print(f"  Rate limited. Waiting {wait_time:.0f}s...")
-                time.sleep(wait_time)
-                continue
-
-            response.raise_for_status()
-            data = response.json()
-
-            # Check rate limit remaining
-            rate_limit = data.get("rateLimit", {})
-            remaining = rate_limit.get("remaining", 20)
-            if remaining < 2:
-                reset_time = rate_limit.get("reset", time.time() + 60)
-                wait_time = max(reset_time - time.time(), 1)
-                print(f"  Rate limit low ({remaining}). Waiting {wait_time:.0f}s...")
-                time.sleep(wait_time)
-
-            return data
-
-        except requests.exceptions.RequestException as e:
-            if attempt < MAX_RETRIES - 1:
-                delay = RETRY_DELAY * (2 ** attempt)
-                print(f"  Request failed: {e}. Retrying in {delay}s...")
-                time.sleep(delay)
+    for attempt in range(2):
+        wait_for_request_slot()
+        response = SESSION.post(API_URL, headers=headers, json=payload, timeout=30)
+        if response.status_code != 429 or attempt:
+            break
+
+        # Still rate limited after the adapter's retries - wait for the window to reset
+        reset_time = int(response.headers.get("X-RateLimit-Reset", time.time() + 60))
+        wait_time = max(reset_time - time.time(), 60)
+        print(f"  Rate limited. Waiting {wait_time:.0f}s...")
+        pause_requests_until(time.time() + wait_time)
+
+    response.raise_for_status()
+    data = PAGE_DECODER.decode(response.content)
+
+    # Check rate limit remaining
+    rate_limit = data.rate_limit or {}
+    remaining = rate_limit.get("remaining", RATE_LIMIT_REQUESTS)
+    if remaining < 2:
+        reset_time = rate_limit.get("reset", time.time() + 60)
+        print(f"  Rate limit low ({remaining}). Waiting {max(reset_time - time.time(), 1):.0f}s...")
+        pause_requests_until(reset_time)
+
+    return data
+
+
+def fetch_page_rows(api_key, page, impact_filter):
+    """Fetch a page and reduce its findings to (id, row) pairs under data["rows"].
+
+    Runs in the fetch threads, so pages waiting in the read-ahead queue only
+    hold finished rows rather than the full decoded payload.
+    """
+    data = fetch_page(api_key, page, impact_filter)
+    return {
+        # The API sends IDs as strings; coerce each one once here so the
+        # fetch loop only does int comparisons
+        "rows": [(int(finding.id), finding_to_row(finding)) for finding in data.findings or ()],
+        "metadata": data.metadata or {},
+        "rateLimit": data.rate_limit or {}
+    }
+
+
+def iter_pages(api_key, impact_filter, prefetch, known_max_id, start_page=1):
+    """Yield (page, data) in page order, keeping up to `prefetch` later pages in flight.
+
+    Later pages are only requested while pages are entirely newer than
+    `known_max_id`, so incremental runs never fetch past the existing data.
+    Paging follows metadata.totalPages when the API sends it; without totals
+    another page is only requested after a full one.
+    The read-ahead window shrinks when the API reports few requests left
+    and grows back by one page per response otherwise.
+    """
+    executor = ThreadPoolExecutor(max_workers=prefetch)
+    pending = deque([(start_page, executor.submit(fetch_page_rows, api_key, start_page, impact_filter))])
+    next_page = start_page + 1
+    window = prefetch
+    try:
+        while pending:
+            page, future = pending.popleft()
+            data = future.result()
+
+            total_pages = data.get("metadata", {}).get("totalPages")
+            rows = data["rows"]
+
+            remaining = data.get("rateLimit", {}).get("remaining", RATE_LIMIT_REQUESTS)
+            if remaining <= window:
+                window = max(window // 2, 1)
+            else:
+                window = min(window + 1, prefetch)
+
+            # Request the next pages before handing this one over, so the
+            # download overlaps with writing this page
+            if total_pages is None:
+                more_pages = len(rows) == PAGE_SIZE
             else:
-                raise
+                more_pages = next_page <= total_pages
+            if more_pages and rows and rows[-1][0] > known_max_id:
+                while (total_pages is None or next_page <= total_pages) and len(pending) < window:
+                    pending.append((next_page, executor.submit(fetch_page_rows, api_key, next_page, impact_filter)))
+                    next_page += 1
 
-    return None
+            yield page, data
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
 
 
 def create_workbook_with_headers():
-    """Create a new workbook with headers."""
-    wb = Workbook()
-    ws = wb.active
+    """Create a new write-only workbook with headers."""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("findings")
     ws.append(HEADERS)
-    return wb
+    return wb, ws
 
 
-def load_or_create_workbook(filepath):
-    """Load existing workbook or create new one with headers."""
-    if filepath.exists():
-        return load_workbook(filepath)
-    return create_workbook_with_headers()
-
-
-def get_existing_ids(filepath):
-    """Get set of existing IDs from xlsx file."""
+def iter_existing_rows(filepath):
+    """Stream data rows (without header) from an existing xlsx file."""
     if not filepath.exists():
-        return set()
+        return
 
     wb = load_workbook(filepath, read_only=True)
-    ws = wb.active
-    ids = set()
-    for row in ws.iter_rows(min_row=2, max_col=1, values_only=True):
-        if row[0]:
-            ids.add(str(row[0]))
-    wb.close()
-    return ids
-
-
-def fetch_category(api_key, impact_filter, xlsx_file, max_id_key, state):
-    """Fetch all findings for a category (HIGH/MEDIUM or LOW/GAS)."""
+    try:
+        yield from wb.active.iter_rows(min_row=2, values_only=True)
+    finally:
+        wb.close()
+
+
+def append_rows_to_log(log_file, rows):
+    """Append rows to the zstd-compressed JSONL findings log as one new frame."""
+    with open(log_file, "ab") as f, ZSTD_COMPRESSOR.stream_writer(f, closefd=False) as writer:
+        for row in rows:
+            writer.write(json_dumps(row) + b"\n")
+
+
+def iter_log_rows(log_file):
+    """Stream rows from the zstd-compressed JSONL findings log."""
+    with open(log_file, "rb") as f:
+        reader = zstd.ZstdDecompressor().stream_reader(f, read_across_frames=True, closefd=False)
+        for line in io.BufferedReader(reader):
+            if line.strip():
+                yield json_loads(line)
+
+
+def seed_log_from_xlsx(xlsx_file, log_file):
+    """Create the findings log from an xlsx file written before the log existed."""
+    print(f"  Seeding {log_file.name} from {xlsx_file.name}...")
+    tmp_file = log_file.with_name(log_file.name + ".tmp")
+    tmp_file.unlink(missing_ok=True)
+    append_rows_to_log(tmp_file, iter_existing_rows(xlsx_file))
+    os.replace(tmp_file, log_file)
+
+
+def iter_spool_reversed(spool_file):
+    """Yield spooled rows last page first, holding one page in memory."""
+    offsets = []
+    with open(spool_file, "rb") as spool:
+        position = 0
+        for line in spool:
+            offsets.append(position)
+            position += len(line)
+
+        for offset in reversed(offsets):
+            spool.seek(offset)
+            yield from json_loads(spool.readline())
+
+
+def rebuild_xlsx(log_file, xlsx_file):
+    """Regenerate the xlsx file by streaming the findings log into a write-only workbook."""
+    if not log_file.exists():
+        print(f"  {log_file.name} not found - leaving {xlsx_file.name} as is")
+        return
+
+    print(f"  Rebuilding {xlsx_file.name} from {log_file.name}...")
+    wb, ws = create_workbook_with_headers()
+    for row in iter_log_rows(log_file):
+        ws.append(row)
+
+    tmp_file = xlsx_file.with_name(xlsx_file.name + ".tmp")
+    wb.save(tmp_file)
+    os.replace(tmp_file, xlsx_file)
+    print(f"  Saved to {xlsx_file}")
+
+
+def request_stop(signum, frame):
+    """Signal handler: finish the page in progress, checkpoint and exit."""
+    print("\n  Stop requested - finishing current page...")
+    STOP_REQUESTED.set()
+    # A second signal interrupts immediately
+    signal.signal(signum, signal.default_int_handler)
+
+
+def fetch_category(api_key, impact_filter, xlsx_file, log_file, max_id_key, state):
+    """Fetch all findings for a category (HIGH/MEDIUM or LOW/GAS).
+
+    Progress is checkpointed to state.json after every page, so an
+    interrupted run resumes from the next page instead of starting over.
+    Once the last page is spooled the checkpoint is marked complete, and a
+    run interrupted while merging redoes the merge without fetching again.
+    """
     category_name = "HIGH/MEDIUM" if "HIGH" in impact_filter else "LOW/GAS"
     print(f"\n{'='*50}")
     print(f"Fetching {category_name} findings...")
@@ -214,88 +470,165 @@ def fetch_category(api_key, impact_filter, xlsx_file, max_id_key, state):
 
     if is_initial_fetch:
         print("Initial fetch - will download all findings")
-        # Create fresh workbook
-        wb = create_workbook_with_headers()
     else:
         print(f"Incremental fetch - max_id: {current_max_id}")
-        # Load existing workbook
-        wb = load_or_create_workbook(xlsx_file)
-
-    ws = wb.active
-
-    page = 1
-    new_findings = []
-    new_max_id = current_max_id
-    total_fetched = 0
+        if not log_file.exists() and xlsx_file.exists():
+            seed_log_from_xlsx(xlsx_file, log_file)
+
+    # New rows are spooled to disk one page per line as they arrive, so only
+    # the current page is held in memory
+    spool_file = log_file.with_suffix(".part")
+    pending_key = max_id_key.replace("_max_id", "_pending")
+    pending = state.get(pending_key)
+
+    if pending and spool_file.exists():
+        # Everything from min_id up was spooled by the interrupted run; newer
+        # findings that arrived since are left for the next run
+        complete = pending.get("complete", False)
+        if complete:
+            print("Resuming interrupted merge of fetched findings")
+        else:
+            print(f"Resuming interrupted fetch at page {pending['page'] + 1}")
+        spool = open(spool_file, "r+b")
+        spool.truncate(pending["spool_size"])
+        spool.seek(0, os.SEEK_END)
+        start_page = pending["page"] + 1
+        new_max_id = int(pending["max_id"])
+        skip_from_id = int(pending["min_id"])
+        total_fetched = pending["count"]
+        log_size = pending["log_size"]
+    else:
+        spool = open(spool_file, "wb")
+        complete = False
+        start_page = 1
+        new_max_id = current_max_id
+        skip_from_id = float("inf")
+        total_fetched = 0
+        log_size = log_file.stat().st_size if log_file.exists() else 0
+
+    min_id = skip_from_id
     should_stop = False
 
-    while not should_stop:
-        print(f"  Fetching page {page}...", end=" ", flush=True)
-
-        data = fetch_page(api_key, page, impact_filter)
-        if not data:
-            print("Failed to fetch page")
-            break
-
-        findings = data.get("findings", [])
-        metadata = data.get("metadata", {})
-        total_results = metadata.get("totalResults", 0)
-        total_pages = metadata.get("totalPages", 0)
+    # Incremental runs usually end within a page or two, so only look one page ahead
+    prefetch = FETCH_WORKERS if is_initial_fetch else 1
 
-        if page == 1:
-            print(f"Total: {total_results} findings, {total_pages} pages")
-        else:
-            print(f"Got {len(findings)} findings")
+    # A complete spool only needs merging
+    pages = () if complete else iter_pages(api_key, impact_filter, prefetch, current_max_id, start_page)
 
-        if not findings:
-            break
+    with spool:
+        for page, data in pages:
+            rows = data["rows"]
+            metadata = data.get("metadata", {})
 
-        for finding in findings:
-            finding_id = int(finding.get("id", 0))
-
-            # Update max ID
-            if finding_id > new_max_id:
-                new_max_id = finding_id
+            if page == 1 and "totalResults" in metadata:
+                print(f"  Page 1: Total: {metadata['totalResults']} findings, {metadata.get('totalPages')} pages")
+            else:
+                print(f"  Page {page}: Got {len(rows)} findings")
 
-            # For incremental fetch, stop when we hit existing data
-            if not is_initial_fetch and finding_id <= current_max_id:
-                print(f"  Reached existing data at ID {finding_id}")
-                should_stop = True
+            # An empty page marks the end of the results
+            if not rows:
                 break
 
-            new_findings.append(finding)
-            total_fetched += 1
-
-        # Check if we've reached the last page
-        if page >= total_pages:
-            break
-
-        page += 1
-        time.sleep(REQUEST_DELAY)
-
-    # Append new findings to worksheet
-    if new_findings:
-        print(f"\n  Adding {len(new_findings)} new findings to xlsx...")
-        for finding in reversed(new_findings):  # Add oldest first so newest is at bottom
-            ws.append(finding_to_row(finding))
+            page_rows = []
+            for finding_id, row in rows:
+                # Skip findings already spooled before an interruption
+                if finding_id >= skip_from_id:
+                    continue
+
+                # Update max ID
+                if finding_id > new_max_id:
+                    new_max_id = finding_id
+
+                # For incremental fetch, stop when we hit existing data
+                # (current_max_id is 0 on initial fetch, so this never triggers)
+                if finding_id <= current_max_id:
+                    print(f"  Reached existing data at ID {finding_id}")
+                    should_stop = True
+                    break
+
+                page_rows.append(row)
+                min_id = finding_id
+
+            if page_rows:
+                # Pages arrive newest first; store each one oldest first
+                page_rows.reverse()
+                spool.write(json_dumps(page_rows) + b"\n")
+                total_fetched += len(page_rows)
+
+            # Checkpoint the page before moving on
+            spool.flush()
+            os.fsync(spool.fileno())
+            state[pending_key] = {
+                "page": page,
+                "max_id": str(new_max_id),
+                "min_id": str(min_id),
+                "count": total_fetched,
+                "spool_size": spool.tell(),
+                "log_size": log_size
+            }
+            save_state(state)
+
+            if should_stop:
+                break
 
-        wb.save(xlsx_file)
-        print(f"  Saved to {xlsx_file}")
+            if STOP_REQUESTED.is_set():
+                print(f"  Stopped after page {page}; the next run resumes from here")
+                return 0
+
+    # Append new findings to the log; main() regenerates the xlsx afterwards
+    if total_fetched:
+        # Record that the spool is final before touching the log, so a crash
+        # during or after the merge truncates the log and merges again
+        state[pending_key]["complete"] = True
+        save_state(state)
+
+        print(f"\n  Adding {total_fetched} new findings to {log_file.name}...")
+        if is_initial_fetch:
+            log_file.unlink(missing_ok=True)
+        elif log_file.exists():
+            # Drop anything a previous attempt appended before it was interrupted
+            os.truncate(log_file, log_size)
+        # Add oldest first so newest is at bottom
+        append_rows_to_log(log_file, iter_spool_reversed(spool_file))
     else:
         print("\n  No new findings to add")
 
-    wb.close()
-
     # Update state
     state[max_id_key] = str(new_max_id)
     count_key = "high_medium_count" if "HIGH" in impact_filter else "low_gas_count"
-    state[count_key] = state.get(count_key, 0) + len(new_findings)
+    state[count_key] = state.get(count_key, 0) + total_fetched
+    state.pop(pending_key, None)
+    save_state(state)
+
+    spool_file.unlink()
+
+    return total_fetched
+
 
-    return len(new_findings)
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        "--no-xlsx", action="store_true",
+        help="only append new findings to the logs; rebuild the xlsx files later"
+    )
+    group.add_argument(
+        "--rebuild-xlsx", action="store_true",
+        help="regenerate the xlsx files from the logs without calling the API"
+    )
+    return parser.parse_args()
 
 
 def main():
     """Main entry point."""
+    args = parse_args()
+
+    if args.rebuild_xlsx:
+        rebuild_xlsx(HIGH_MEDIUM_LOG, HIGH_MEDIUM_FILE)
+        rebuild_xlsx(LOW_GAS_LOG, LOW_GAS_FILE)
+        return
+
     print("="*60)
     print("Solodit Findings Crawler")
     print(f"Started at: {datetime.now(timezone.utc).isoformat()}")
@@ -304,37 +637,50 @@ def main():
     api_key = get_api_key()
     state = load_state()
 
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
     if state.get("last_run"):
         print(f"Last run: {state['last_run']}")
     else:
         print("First run - will perform initial full fetch")
 
-    total_new = 0
-
     # Fetch HIGH/MEDIUM findings
-    total_new += fetch_category(
+    high_medium_new = fetch_category(
         api_key,
         ["HIGH", "MEDIUM"],
         HIGH_MEDIUM_FILE,
+        HIGH_MEDIUM_LOG,
         "high_medium_max_id",
         state
     )
 
     # Fetch LOW/GAS findings
-    total_new += fetch_category(
-        api_key,
-        ["LOW", "GAS"],
-        LOW_GAS_FILE,
-        "low_gas_max_id",
-        state
-    )
+    low_gas_new = 0
+    if not STOP_REQUESTED.is_set():
+        low_gas_new = fetch_category(
+            api_key,
+            ["LOW", "GAS"],
+            LOW_GAS_FILE,
+            LOW_GAS_LOG,
+            "low_gas_max_id",
+            state
+        )
 
     # Save state
     save_state(state)
 
+    # Regenerate only the xlsx files whose logs changed
+    if not args.no_xlsx and (high_medium_new or low_gas_new):
+        print()
+        if high_medium_new:
+            rebuild_xlsx(HIGH_MEDIUM_LOG, HIGH_MEDIUM_FILE)
+        if low_gas_new:
+            rebuild_xlsx(LOW_GAS_LOG, LOW_GAS_FILE)
+
     print("\n" + "="*60)
     print(f"Completed at: {datetime.now(timezone.utc).isoformat()}")
-    print(f"Total new findings: {total_new}")
+    print(f"Total new findings: {high_medium_new + low_gas_new}")
     print(f"HIGH/MEDIUM count: {state.get('high_medium_count', 0)}")
     print(f"LOW/GAS count: {state.get('low_gas_count', 0)}")
     print("="*60)